@@ -0,0 +1,478 @@
+from random import random
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ImplicitTreap(Generic[T]):
+    """
+    A sequence supporting insertion, deletion, random access, split, merge and range reversal
+    in expected O(log N), as an alternative to SqrtList for large N.
+    Nodes are stored in flat lists (left, right, priority, size, value, lazy reverse) and
+    split/merge are iterative, so there is no recursion.
+    If `op` and `e` are given, range products of the monoid are available through `prod`.
+    `op` must be commutative when `reverse` is used together with `prod`.
+    """
+
+    def __init__(
+        self,
+        a: Iterable[T] = (),
+        op: Optional[Callable[[T, T], T]] = None,
+        e: T = None,
+    ) -> None:
+        """
+        Initialize the sequence with an iterable.
+        Time complexity: O(N), where N is the size of the iterable.
+        """
+        self._op = op
+        self._e = e
+        # node 0 is the null node
+        self._left = [0]
+        self._right = [0]
+        self._pri = [-1.0]
+        self._size = [0]
+        self._val = [e]
+        self._agg = [e]
+        self._rev = [False]
+        # nodes released by pop, reused by _new_node
+        self._free: List[int] = []
+        self._root = self._build(list(a))
+
+    def _new_node(self, x: T) -> int:
+        """
+        Allocate a node, reusing one released by `pop` if possible.
+        """
+        if self._free:
+            t = self._free.pop()
+            self._left[t] = 0
+            self._right[t] = 0
+            self._pri[t] = random()
+            self._size[t] = 1
+            self._val[t] = x
+            self._agg[t] = x
+            self._rev[t] = False
+            return t
+        self._left.append(0)
+        self._right.append(0)
+        self._pri.append(random())
+        self._size.append(1)
+        self._val.append(x)
+        self._agg.append(x)
+        self._rev.append(False)
+        return len(self._val) - 1
+
+    def _build(self, a: List[T]) -> int:
+        """
+        Build a treap from a list with a Cartesian-tree stack.
+        Time complexity: O(N).
+        """
+        if not a:
+            return 0
+        left, right, pri = self._left, self._right, self._pri
+        st = []
+        for x in a:
+            v = self._new_node(x)
+            last = 0
+            while st and pri[st[-1]] < pri[v]:
+                last = st.pop()
+            left[v] = last
+            if st:
+                right[st[-1]] = v
+            st.append(v)
+        root = st[0]
+        order = [root]
+        for v in order:
+            if left[v]:
+                order.append(left[v])
+            if right[v]:
+                order.append(right[v])
+        for v in reversed(order):
+            self._update(v)
+        return root
+
+    def _update(self, t: int) -> None:
+        l, r = self._left[t], self._right[t]
+        self._size[t] = self._size[l] + self._size[r] + 1
+        if self._op is not None:
+            self._agg[t] = self._op(self._op(self._agg[l], self._val[t]), self._agg[r])
+
+    def _push(self, t: int) -> None:
+        if self._rev[t]:
+            self._rev[t] = False
+            l, r = self._left[t], self._right[t]
+            self._left[t], self._right[t] = r, l
+            if l:
+                self._rev[l] ^= True
+            if r:
+                self._rev[r] ^= True
+
+    def _split(self, t: int, k: int):
+        """
+        Split the tree t into the first k elements and the rest.
+        push/update are inlined for speed.
+        Time complexity: expected O(log N).
+        """
+        left, right, size, rev = self._left, self._right, self._size, self._rev
+        lroot = rroot = 0
+        lt = rt = 0
+        path = []
+        while t:
+            if rev[t]:
+                rev[t] = False
+                l = left[t]
+                r = right[t]
+                left[t] = r
+                right[t] = l
+                if l:
+                    rev[l] = not rev[l]
+                if r:
+                    rev[r] = not rev[r]
+            path.append(t)
+            ls = size[left[t]]
+            if k <= ls:
+                if rt:
+                    left[rt] = t
+                else:
+                    rroot = t
+                rt = t
+                t = left[t]
+            else:
+                if lt:
+                    right[lt] = t
+                else:
+                    lroot = t
+                lt = t
+                k -= ls + 1
+                t = right[t]
+        if rt:
+            left[rt] = 0
+        if lt:
+            right[lt] = 0
+        self._fix(path)
+        return lroot, rroot
+
+    def _fix(self, path: List[int]) -> None:
+        """
+        Recompute size (and product) of the nodes on path, from the deepest one.
+        """
+        left, right, size = self._left, self._right, self._size
+        op = self._op
+        if op is None:
+            for v in reversed(path):
+                size[v] = size[left[v]] + size[right[v]] + 1
+        else:
+            agg, val = self._agg, self._val
+            for v in reversed(path):
+                l = left[v]
+                r = right[v]
+                size[v] = size[l] + size[r] + 1
+                agg[v] = op(op(agg[l], val[v]), agg[r])
+
+    def _merge(self, a: int, b: int) -> int:
+        """
+        Concatenate the trees a and b.
+        push/update are inlined for speed.
+        Time complexity: expected O(log N).
+        """
+        if not a:
+            return b
+        if not b:
+            return a
+        left, right, pri, rev = self._left, self._right, self._pri, self._rev
+        root = 0
+        parent = 0
+        to_right = False
+        path = []
+        while a and b:
+            if pri[a] > pri[b]:
+                v = a
+            else:
+                v = b
+            if rev[v]:
+                rev[v] = False
+                l = left[v]
+                r = right[v]
+                left[v] = r
+                right[v] = l
+                if l:
+                    rev[l] = not rev[l]
+                if r:
+                    rev[r] = not rev[r]
+            if v == a:
+                a = right[a]
+                nxt_right = True
+            else:
+                b = left[b]
+                nxt_right = False
+            if not parent:
+                root = v
+            elif to_right:
+                right[parent] = v
+            else:
+                left[parent] = v
+            path.append(v)
+            parent, to_right = v, nxt_right
+        if to_right:
+            right[parent] = a or b
+        else:
+            left[parent] = a or b
+        self._fix(path)
+        return root
+
+    def _shared(self, root: int) -> "ImplicitTreap[T]":
+        """
+        Create another treap which shares the node storage with self.
+        """
+        res = object.__new__(ImplicitTreap)
+        res.__dict__.update(self.__dict__)
+        res._root = root
+        return res
+
+    def __len__(self) -> int:
+        """
+        Return the number of elements.
+        Time complexity: O(1).
+        """
+        return self._size[self._root]
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over all elements.
+        Time complexity: O(N).
+        """
+        left, right, val = self._left, self._right, self._val
+        st = []
+        t = self._root
+        while st or t:
+            while t:
+                self._push(t)
+                st.append(t)
+                t = left[t]
+            t = st.pop()
+            yield val[t]
+            t = right[t]
+
+    def __eq__(self, other) -> bool:
+        """
+        Check if the sequence is equal to another iterable.
+        Time complexity: O(N).
+        """
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation.
+        Time complexity: O(N).
+        """
+        return "ImplicitTreap" + str(list(self))
+
+    def _find(self, i: int) -> List[int]:
+        """
+        Return the path from the root to the i-th node.
+        Time complexity: expected O(log N).
+        """
+        assert 0 <= i < len(self) or -len(self) <= i <= -1
+        if i < 0:
+            i += len(self)
+        left, right, size = self._left, self._right, self._size
+        path = []
+        t = self._root
+        while True:
+            self._push(t)
+            path.append(t)
+            ls = size[left[t]]
+            if i < ls:
+                t = left[t]
+            elif i == ls:
+                return path
+            else:
+                i -= ls + 1
+                t = right[t]
+
+    def __getitem__(self, i: int) -> T:
+        """
+        Access an element by index.
+        Time complexity: expected O(log N).
+        """
+        return self._val[self._find(i)[-1]]
+
+    def __setitem__(self, i: int, x: T) -> None:
+        """
+        Set the value of an element by index.
+        Time complexity: expected O(log N).
+        """
+        path = self._find(i)
+        self._val[path[-1]] = x
+        for v in reversed(path):
+            self._update(v)
+
+    def insert(self, i: int, x: T) -> None:
+        """
+        Insert an element at a specific position.
+        Descends once from the root to the place where the new node belongs by priority,
+        and splits only the subtree below it.
+        Time complexity: expected O(log N).
+        """
+        n = len(self)
+        assert 0 <= i <= n or -n <= i <= -1
+        if i < 0:
+            i += n
+        left, right, size, pri, rev = (
+            self._left,
+            self._right,
+            self._size,
+            self._pri,
+            self._rev,
+        )
+        v = self._new_node(x)
+        pv = pri[v]
+        path = []
+        parent = 0
+        to_right = False
+        t = self._root
+        while t and pri[t] > pv:
+            if rev[t]:
+                rev[t] = False
+                l = left[t]
+                r = right[t]
+                left[t] = r
+                right[t] = l
+                if l:
+                    rev[l] = not rev[l]
+                if r:
+                    rev[r] = not rev[r]
+            path.append(t)
+            parent = t
+            ls = size[left[t]]
+            if i <= ls:
+                to_right = False
+                t = left[t]
+            else:
+                i -= ls + 1
+                to_right = True
+                t = right[t]
+        left[v], right[v] = self._split(t, i)
+        path.append(v)
+        if not parent:
+            self._root = v
+        elif to_right:
+            right[parent] = v
+        else:
+            left[parent] = v
+        self._fix(path)
+
+    def append(self, x: T) -> None:
+        """
+        Append an element to the end.
+        Time complexity: expected O(log N).
+        """
+        self._root = self._merge(self._root, self._new_node(x))
+
+    def pop(self, i: int = -1) -> T:
+        """
+        Remove and return the element at the specified index.
+        Descends once to the node and replaces it with the merge of its children.
+        The node is released for reuse.
+        Time complexity: expected O(log N).
+        """
+        n = len(self)
+        assert 0 <= i < n or -n <= i <= -1
+        if i < 0:
+            i += n
+        left, right, size, rev = self._left, self._right, self._size, self._rev
+        path = []
+        parent = 0
+        to_right = False
+        t = self._root
+        while True:
+            if rev[t]:
+                rev[t] = False
+                l = left[t]
+                r = right[t]
+                left[t] = r
+                right[t] = l
+                if l:
+                    rev[l] = not rev[l]
+                if r:
+                    rev[r] = not rev[r]
+            ls = size[left[t]]
+            if i == ls:
+                break
+            path.append(t)
+            parent = t
+            if i < ls:
+                to_right = False
+                t = left[t]
+            else:
+                i -= ls + 1
+                to_right = True
+                t = right[t]
+        m = self._merge(left[t], right[t])
+        if not parent:
+            self._root = m
+        elif to_right:
+            right[parent] = m
+        else:
+            left[parent] = m
+        self._fix(path)
+        x = self._val[t]
+        self._val[t] = self._agg[t] = None
+        self._free.append(t)
+        return x
+
+    def split(self, k: int) -> "ImplicitTreap[T]":
+        """
+        Keep the first k elements in self and return the rest as a new treap.
+        The returned treap shares the node storage with self.
+        Time complexity: expected O(log N).
+        """
+        assert 0 <= k <= len(self)
+        a, b = self._split(self._root, k)
+        self._root = a
+        return self._shared(b)
+
+    def merge(self, other: "ImplicitTreap[T]") -> None:
+        """
+        Append all elements of other to the end of self. other becomes empty.
+        Time complexity: expected O(log N) if other shares the storage with self
+        (e.g. it was created by `split`), otherwise O(M log N).
+        """
+        if other._val is self._val:
+            self._root = self._merge(self._root, other._root)
+        else:
+            for x in other:
+                self.append(x)
+        other._root = 0
+
+    def reverse(self, l: int, r: int) -> None:
+        """
+        Reverse the elements in [l, r).
+        Time complexity: expected O(log N).
+        """
+        assert 0 <= l <= r <= len(self)
+        a, b = self._split(self._root, l)
+        m, c = self._split(b, r - l)
+        if m:
+            self._rev[m] ^= True
+        self._root = self._merge(self._merge(a, m), c)
+
+    def prod(self, l: int, r: int) -> T:
+        """
+        Return op(a[l], ..., a[r - 1]), or e if l == r.
+        Time complexity: expected O(log N).
+        """
+        assert self._op is not None
+        assert 0 <= l <= r <= len(self)
+        a, b = self._split(self._root, l)
+        m, c = self._split(b, r - l)
+        res = self._agg[m]
+        self._root = self._merge(self._merge(a, m), c)
+        return res
+
+    def all_prod(self) -> T:
+        """
+        Return the product of all elements.
+        Time complexity: O(1).
+        """
+        assert self._op is not None
+        return self._agg[self._root]
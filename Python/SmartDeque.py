@@ -78,7 +78,14 @@ class SmartDeque(Generic[T]):
         """
         if isinstance(i, slice):
             start, stop, step = i.indices(self._size)
-            return [self[idx] for idx in range(start, stop, step)]
+            if step > 0:
+                if start >= stop:
+                    return []
+                return self._range(start, stop)[::step]
+            else:
+                if start <= stop:
+                    return []
+                return self._range(stop + 1, start + 1)[::step]
         else:
             assert 0 <= i < self._size or -self._size <= i < 0
             if i < 0:
@@ -88,11 +95,61 @@ class SmartDeque(Generic[T]):
             else:
                 return self._r[self._r_delled + i - (len(self._l) - self._l_delled)]
 
-    def __setitem__(self, i: int, x: T) -> None:
+    def _range(self, start: int, stop: int) -> List[T]:
         """
-        Set the value at the specified index.
-        Time complexity: O(1).
+        Return the elements in [start, stop) as a list, using list slicing on the backing lists.
+        Time complexity: O(k), where k = stop - start.
+        """
+        left = len(self._l) - self._l_delled
+        res = []
+        if start < left:
+            res = self._l[len(self._l) - min(stop, left) : len(self._l) - start][::-1]
+        if stop > left:
+            res += self._r[
+                self._r_delled + max(start - left, 0) : self._r_delled + stop - left
+            ]
+        return res
+
+    def __setitem__(self, i, x) -> None:
         """
+        Set the value at the specified index, or assign an iterable to a slice.
+        Time complexity: O(1) for single access, O(k) for slicing of the same length,
+        O(n) if the slice assignment changes the length.
+        """
+        if isinstance(i, slice):
+            x = list(x)
+            start, stop, step = i.indices(self._size)
+            if step == 1:
+                stop = max(start, stop)
+                if stop - start != len(x):
+                    tmp = list(self)
+                    tmp[start:stop] = x
+                    assert len(tmp) <= self._maxlen
+                    mid = len(tmp) >> 1
+                    self._l = tmp[:mid][::-1]
+                    self._r = tmp[mid:]
+                    self._l_delled = 0
+                    self._r_delled = 0
+                    self._size = len(tmp)
+                    return
+                left = len(self._l) - self._l_delled
+                k = max(min(stop, left) - start, 0)
+                if k:
+                    self._l[len(self._l) - start - k : len(self._l) - start] = x[:k][
+                        ::-1
+                    ]
+                if k < len(x):
+                    s = self._r_delled + max(start - left, 0)
+                    self._r[s : s + len(x) - k] = x[k:]
+                return
+            idx = range(start, stop, step)
+            if len(idx) != len(x):
+                raise ValueError(
+                    f"attempt to assign sequence of size {len(x)} to extended slice of size {len(idx)}"
+                )
+            for j, y in zip(idx, x):
+                self[j] = y
+            return
         assert 0 <= i <= self._size or -self._size <= i <= -1
         if i < 0:
             i += self._size
@@ -270,16 +327,52 @@ class SmartDeque(Generic[T]):
         Extend the deque to the right with the elements from the iterable.
         Time complexity: O(k), where k is the length of the iterable.
         """
-        for i in v:
-            self.append(i)
+        v = list(v)
+        self._r.extend(v)
+        self._size += len(v)
+        if self._size > self._maxlen:
+            self.popleft_n(self._size - self._maxlen)
 
     def extendleft(self, v: Iterable[T]) -> None:
         """
         Extend the deque to the left with the elements from the iterable.
         Time complexity: O(k), where k is the length of the iterable.
         """
-        for i in v:
-            self.appendleft(i)
+        v = list(v)
+        self._l.extend(v)
+        self._size += len(v)
+        if self._size > self._maxlen:
+            self.pop_n(self._size - self._maxlen)
+
+    def pop_n(self, k: int) -> List[T]:
+        """
+        Remove k elements from the right end and return them in the order `pop` would.
+        Time complexity: O(k).
+        """
+        assert 0 <= k <= self._size
+        self._size -= k
+        t = min(k, len(self._r) - self._r_delled)
+        res = self._r[len(self._r) - t :][::-1]
+        del self._r[len(self._r) - t :]
+        if k > t:
+            res += self._l[self._l_delled : self._l_delled + k - t]
+            self._l_delled += k - t
+        return res
+
+    def popleft_n(self, k: int) -> List[T]:
+        """
+        Remove k elements from the left end and return them in the order `popleft` would.
+        Time complexity: O(k).
+        """
+        assert 0 <= k <= self._size
+        self._size -= k
+        t = min(k, len(self._l) - self._l_delled)
+        res = self._l[len(self._l) - t :][::-1]
+        del self._l[len(self._l) - t :]
+        if k > t:
+            res += self._r[self._r_delled : self._r_delled + k - t]
+            self._r_delled += k - t
+        return res
 
     def insert(self, i: int, x: T) -> None:
         """
@@ -358,3 +451,279 @@ class SmartDeque(Generic[T]):
         self._r = tmp[mid:]
         self._l_delled = 0
         self._r_delled = 0
+
+
+class RingDeque(Generic[T]):
+    """
+    A double-ended queue backed by a ring buffer whose capacity is a power of two.
+    Supports O(1) index access and amortized O(1) insertion/removal at both ends.
+    `rotate(k)` only records the offset, but the next insertion/removal moves min(k, n - k)
+    elements to apply it, so a rotate followed by a push/pop costs O(min(k, n - k)).
+    Removed slots are released immediately and the buffer grows/shrinks automatically,
+    so there is no garbage to `clean`.
+    """
+
+    MIN_CAPACITY = 8
+
+    def __init__(self, v: Iterable[T] = (), maxlen: int = 1 << 60):
+        """
+        Initialize the deque with an optional iterable and maximum length.
+        Time complexity: O(n), where n is the size of the input iterable.
+        """
+        v = list(v)
+        assert len(v) <= maxlen
+        self._maxlen = maxlen
+        self._size = len(v)
+        cap = self.MIN_CAPACITY
+        while cap <= self._size:
+            cap <<= 1
+        self._buf: List[T] = v + [None] * (cap - self._size)
+        self._mask = cap - 1
+        self._head = 0
+        # logical index i is stored at (head + (i - rot) mod size) & mask
+        self._rot = 0
+
+    def _normalize(self) -> None:
+        """
+        Apply the pending rotation to the buffer.
+        Time complexity: O(1) if the buffer is full, otherwise O(min(k, n - k)).
+        """
+        rot = self._rot
+        if rot == 0:
+            return
+        self._rot = 0
+        mask, n, h = self._mask, self._size, self._head
+        if n == mask + 1:
+            self._head = (h - rot) & mask
+        elif rot <= n - rot:
+            # move the last rot elements in front of the head
+            src = (h + n - rot) & mask
+            v = self._read(src, rot)
+            self._write(src, [None] * rot)
+            self._head = (h - rot) & mask
+            self._write(self._head, v)
+        else:
+            # move the first n - rot elements behind the tail
+            k = n - rot
+            v = self._read(h, k)
+            self._write(h, [None] * k)
+            self._write((h + n) & mask, v)
+            self._head = (h + k) & mask
+
+    def _read(self, p: int, k: int) -> List[T]:
+        """
+        Return the k slots starting at physical position p, wrapping around.
+        """
+        cap = self._mask + 1
+        if p + k <= cap:
+            return self._buf[p : p + k]
+        return self._buf[p:] + self._buf[: p + k - cap]
+
+    def _write(self, p: int, v: List[T]) -> None:
+        """
+        Overwrite the len(v) slots starting at physical position p, wrapping around.
+        """
+        cap = self._mask + 1
+        k = len(v)
+        if p + k <= cap:
+            self._buf[p : p + k] = v
+        else:
+            self._buf[p:] = v[: cap - p]
+            self._buf[: p + k - cap] = v[cap - p :]
+
+    def _resize(self, cap: int) -> None:
+        """
+        Reallocate the buffer with the given capacity.
+        Time complexity: O(n).
+        """
+        v = list(self)
+        self._buf = v + [None] * (cap - self._size)
+        self._mask = cap - 1
+        self._head = 0
+        self._rot = 0
+
+    def _shrink(self) -> None:
+        cap = self._mask + 1
+        if cap > self.MIN_CAPACITY and self._size << 2 < cap:
+            self._resize(cap >> 1)
+
+    def _physical(self, i: int) -> int:
+        if self._rot:
+            i -= self._rot
+            if i < 0:
+                i += self._size
+        return (self._head + i) & self._mask
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterate over the elements of the deque.
+        Time complexity: O(n).
+        """
+        for i in range(self._size):
+            yield self._buf[self._physical(i)]
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        Iterate over the deque in reverse order.
+        Time complexity: O(n).
+        """
+        for i in reversed(range(self._size)):
+            yield self._buf[self._physical(i)]
+
+    def __eq__(self, other) -> bool:
+        """
+        Check if this deque is equal to another iterable.
+        Time complexity: O(n).
+        """
+        return list(self) == list(other)
+
+    def __len__(self) -> int:
+        """
+        Return the number of elements in the deque.
+        Time complexity: O(1).
+        """
+        return self._size
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the deque.
+        Time complexity: O(n).
+        """
+        return f"RingDeque: {list(self)}"
+
+    def __contains__(self, x: T) -> bool:
+        """
+        Check if the deque contains the specified element.
+        Time complexity: O(n).
+        """
+        return any(y == x for y in self)
+
+    def __getitem__(self, i: int) -> T:
+        """
+        Access an element by index.
+        Time complexity: O(1).
+        """
+        assert 0 <= i < self._size or -self._size <= i < 0
+        if i < 0:
+            i += self._size
+        return self._buf[self._physical(i)]
+
+    def __setitem__(self, i: int, x: T) -> None:
+        """
+        Set the value at the specified index.
+        Time complexity: O(1).
+        """
+        assert 0 <= i < self._size or -self._size <= i < 0
+        if i < 0:
+            i += self._size
+        self._buf[self._physical(i)] = x
+
+    def clear(self) -> None:
+        """
+        Remove all elements from the deque.
+        Time complexity: O(1).
+        """
+        self._buf = [None] * self.MIN_CAPACITY
+        self._mask = self.MIN_CAPACITY - 1
+        self._head = 0
+        self._rot = 0
+        self._size = 0
+
+    def append(self, x: T) -> None:
+        """
+        Add an element to the right end of the deque.
+        Time complexity: amortized O(1).
+        """
+        self._normalize()
+        if self._size == self._mask + 1:
+            self._resize(self._size << 1)
+        self._buf[(self._head + self._size) & self._mask] = x
+        self._size += 1
+        if self._size > self._maxlen:
+            self.popleft()
+
+    def appendleft(self, x: T) -> None:
+        """
+        Add an element to the left end of the deque.
+        Time complexity: amortized O(1).
+        """
+        self._normalize()
+        if self._size == self._mask + 1:
+            self._resize(self._size << 1)
+        self._head = (self._head - 1) & self._mask
+        self._buf[self._head] = x
+        self._size += 1
+        if self._size > self._maxlen:
+            self.pop()
+
+    def pop(self) -> T:
+        """
+        Remove and return the rightmost element of the deque.
+        Time complexity: amortized O(1).
+        """
+        assert self._size > 0
+        self._normalize()
+        self._size -= 1
+        p = (self._head + self._size) & self._mask
+        x = self._buf[p]
+        self._buf[p] = None
+        self._shrink()
+        return x
+
+    def popleft(self) -> T:
+        """
+        Remove and return the leftmost element of the deque.
+        Time complexity: amortized O(1).
+        """
+        assert self._size > 0
+        self._normalize()
+        self._size -= 1
+        x = self._buf[self._head]
+        self._buf[self._head] = None
+        self._head = (self._head + 1) & self._mask
+        self._shrink()
+        return x
+
+    def extend(self, v: Iterable[T]) -> None:
+        """
+        Extend the deque to the right with the elements from the iterable.
+        Time complexity: O(k), where k is the length of the iterable.
+        """
+        for i in v:
+            self.append(i)
+
+    def extendleft(self, v: Iterable[T]) -> None:
+        """
+        Extend the deque to the left with the elements from the iterable.
+        Time complexity: O(k), where k is the length of the iterable.
+        """
+        for i in v:
+            self.appendleft(i)
+
+    def rotate(self, k: int = 1) -> None:
+        """
+        Rotate the deque k steps to the right. Negative values rotate to the left.
+        Time complexity: O(1) here, but the next push/pop applies the rotation to the buffer
+        in O(min(k, n - k)) (O(1) if the buffer is full).
+        """
+        if self._size == 0:
+            return
+        self._rot = (self._rot + k) % self._size
+
+    @property
+    def maxlen(self) -> int:
+        """
+        Return the maximum allowable size of the deque.
+        Time complexity: O(1).
+        """
+        return self._maxlen
+
+    @maxlen.setter
+    def maxlen(self, x: int) -> None:
+        """
+        Update the maximum size of the deque.
+        Raises an error if the current size exceeds the new maxlen.
+        Time complexity: O(1).
+        """
+        assert self._size <= x
+        self._maxlen = x
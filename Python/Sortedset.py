@@ -1,5 +1,6 @@
 # https://github.com/tatyam-prime/SortedSet/blob/main/SortedSet.py
 import math
+from array import array
 from bisect import bisect_left, bisect_right
 from typing import Generic, Iterable, Iterator, List, Tuple, TypeVar, Optional
 
@@ -166,3 +167,35 @@ class SortedSet(Generic[T]):
                 return ans + bisect_right(a, x)
             ans += len(a)
         return ans
+
+
+class IntSortedSet(SortedSet[int]):
+    """
+    SortedSet specialized for 64-bit signed integers.
+    Each bucket is array('q') instead of list, so memory per element is 8 bytes
+    (list of int is about 36 bytes), and bucket splits / slice copies are cheaper.
+    """
+
+    def __init__(self, a: Iterable[int] = []) -> None:
+        "Make a new IntSortedSet from iterable. / O(N) if sorted and unique / O(N log N)"
+        super().__init__(a)
+        self.a = [array("q", i) for i in self.a]
+
+    def __repr__(self) -> str:
+        return "IntSortedSet" + str([list(i) for i in self.a])
+
+    def add(self, x: int) -> bool:
+        "Add an element and return True if added. / O(√N)"
+        if self.size == 0:
+            self.a = [array("q", [x])]
+            self.size = 1
+            return True
+        a, b, i = self._position(x)
+        if i != len(a) and a[i] == x:
+            return False
+        a.insert(i, x)
+        self.size += 1
+        if len(a) > len(self.a) * self.SPLIT_RATIO:
+            mid = len(a) >> 1
+            self.a[b : b + 1] = [a[:mid], a[mid:]]
+        return True
@@ -1,6 +1,7 @@
 # https://github.com/tatyam-prime/SortedSet/blob/main/SortedMultiset.py を元に改造したものです。
 import math
-from typing import Generic, Iterable, Iterator, List, Tuple, TypeVar
+from functools import reduce
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 T = TypeVar("T")
 
@@ -8,16 +9,25 @@ T = TypeVar("T")
 class SqrtList(Generic[T]):
     """
     A list-like structure supporting efficient random access, insertions, and deletions in O(√N).
+    If a monoid (`op`, `e`) is given, range products are available through `prod` in O(√N).
+    The product of each bucket is cached and invalidated when the bucket is edited.
     """
 
     BUCKET_RATIO = 16
     SPLIT_RATIO = 24
 
-    def __init__(self, a: Iterable[T] = ()) -> None:
-        """
-        Initialize the structure with an iterable.
+    def __init__(
+        self,
+        a: Iterable[T] = (),
+        op: Optional[Callable[[T, T], T]] = None,
+        e: T = None,
+    ) -> None:
+        """
+        Initialize the structure with an iterable and an optional monoid (op, e).
         Time complexity: O(N), where N is the size of the iterable.
         """
+        self._op = op
+        self._e = e
         a = list(a)
         n = self.size = len(a)
         num_bucket = int(math.ceil(math.sqrt(n / self.BUCKET_RATIO)))
@@ -25,6 +35,8 @@ class SqrtList(Generic[T]):
             a[n * i // num_bucket : n * (i + 1) // num_bucket]
             for i in range(num_bucket)
         ]
+        # cached product of each bucket. None means it has to be recomputed.
+        self._agg: List[Optional[T]] = [None] * num_bucket
 
     def __iter__(self) -> Iterator[T]:
         """
@@ -114,6 +126,16 @@ class SqrtList(Generic[T]):
                     return a, b, i
             return self.a[-1], len(self.a) - 1, len(self.a[-1])
 
+    def _split_bucket(self, b: int) -> None:
+        """
+        Split the b-th bucket into two halves.
+        Time complexity: O(√N).
+        """
+        a = self.a[b]
+        mid = len(a) >> 1
+        self.a[b : b + 1] = [a[:mid], a[mid:]]
+        self._agg[b : b + 1] = [None, None]
+
     def append(self, x: T) -> None:
         """
         Append an element to the end.
@@ -121,14 +143,15 @@ class SqrtList(Generic[T]):
         """
         if self.size == 0:
             self.a = [[x]]
+            self._agg = [None]
             self.size = 1
             return
         a, b, i = self.a[-1], len(self.a) - 1, len(self.a[-1])
         a.append(x)
         self.size += 1
+        self._agg[b] = None
         if len(a) > len(self.a) * self.SPLIT_RATIO:
-            mid = len(a) >> 1
-            self.a[b : b + 1] = [a[:mid], a[mid:]]
+            self._split_bucket(b)
 
     def appendleft(self, x: T) -> None:
         """
@@ -137,14 +160,15 @@ class SqrtList(Generic[T]):
         """
         if self.size == 0:
             self.a = [[x]]
+            self._agg = [None]
             self.size = 1
             return
         a, b, i = self.a[0], 0, 0
         a.insert(0, x)
         self.size += 1
+        self._agg[b] = None
         if len(a) > len(self.a) * self.SPLIT_RATIO:
-            mid = len(a) >> 1
-            self.a[b : b + 1] = [a[:mid], a[mid:]]
+            self._split_bucket(b)
 
     def insert(self, i: int, x: T) -> None:
         """
@@ -154,32 +178,153 @@ class SqrtList(Generic[T]):
         assert 0 <= i <= self.size + 1 or -self.size <= i <= -1, (i, self.size)
         if self.size == 0:
             self.a = [[x]]
+            self._agg = [None]
             self.size = 1
             return
         a, b, i = self._position(i)
         a.insert(i, x)
         self.size += 1
+        self._agg[b] = None
         if len(a) > len(self.a) * self.SPLIT_RATIO:
-            mid = len(a) >> 1
-            self.a[b : b + 1] = [a[:mid], a[mid:]]
+            self._split_bucket(b)
 
-    def __getitem__(self, i: int) -> T:
+    def _range(self, l: int, r: int) -> List[T]:
         """
-        Access an element by index.
-        Time complexity: O(√N).
+        Return the elements in [l, r) as a list.
+        Time complexity: O(√N + k), where k = r - l.
         """
+        res = []
+        pos = 0
+        for a in self.a:
+            if pos >= r:
+                break
+            nxt = pos + len(a)
+            if l < nxt:
+                res += a[max(l - pos, 0) : min(r, nxt) - pos]
+            pos = nxt
+        return res
+
+    def __getitem__(self, i):
+        """
+        Access an element by index, or a slice as a list.
+        Time complexity: O(√N) for single access, O(√N + k) for slicing.
+        """
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.size)
+            if step > 0:
+                if start >= stop:
+                    return []
+                return self._range(start, stop)[::step]
+            else:
+                if start <= stop:
+                    return []
+                return self._range(stop + 1, start + 1)[::step]
         assert 0 <= i <= self.size or -self.size <= i <= -1
         a, _, i = self._position(i)
         return a[i]
 
+    def _cut(self, i: int) -> int:
+        """
+        Split a bucket so that a bucket boundary lies just before the i-th element,
+        and return the index of the bucket starting at i (len(self.a) if i == size).
+        Time complexity: O(√N).
+        """
+        pos = 0
+        for b, a in enumerate(self.a):
+            if i <= pos:
+                return b
+            if i < pos + len(a):
+                self.a[b : b + 1] = [a[: i - pos], a[i - pos :]]
+                self._agg[b : b + 1] = [None, None]
+                return b + 1
+            pos += len(a)
+        return len(self.a)
+
+    def _merge_small(self, b: int) -> None:
+        """
+        Merge the (b-1)-th and b-th buckets if they are small enough together.
+        Time complexity: O(√N).
+        """
+        if 0 < b < len(self.a):
+            if (
+                len(self.a[b - 1]) + len(self.a[b])
+                <= len(self.a) * self.SPLIT_RATIO >> 1
+            ):
+                self.a[b - 1] += self.a[b]
+                del self.a[b]
+                self._agg[b - 1 : b + 1] = [None]
+
+    def __delitem__(self, i) -> None:
+        """
+        Delete an element by index, or a slice.
+        Contiguous slices are cut at both ends and whole buckets are removed.
+        Time complexity: O(√N) for single access, O(√N + B) for contiguous slices,
+        O(N) for slices with step != 1.
+        """
+        if not isinstance(i, slice):
+            self.pop(i)
+            return
+        start, stop, step = i.indices(self.size)
+        if step != 1:
+            tmp = list(self)
+            del tmp[i]
+            self.__init__(tmp, self._op, self._e)
+            return
+        if start >= stop:
+            return
+        l = self._cut(start)
+        r = self._cut(stop)
+        del self.a[l:r]
+        del self._agg[l:r]
+        self.size -= stop - start
+        self._merge_small(l)
+
+    def insert_many(self, i: int, items: Iterable[T]) -> None:
+        """
+        Insert all elements of items before the i-th element.
+        The items are packed into new buckets, which are inserted as a whole.
+        Time complexity: O(√N + k), where k is the number of items.
+        """
+        assert 0 <= i <= self.size or -self.size <= i <= -1
+        if i < 0:
+            i += self.size
+        items = list(items)
+        if not items:
+            return
+        b = self._cut(i)
+        self.size += len(items)
+        width = max(1, int(math.sqrt(self.size * self.BUCKET_RATIO)))
+        new = [items[j : j + width] for j in range(0, len(items), width)]
+        self.a[b:b] = new
+        self._agg[b:b] = [None] * len(new)
+        self._merge_small(b + len(new))
+        self._merge_small(b)
+
+    def reverse(self, l: int, r: int) -> None:
+        """
+        Reverse the elements in [l, r).
+        The range is cut at both ends, then the order of buckets and each bucket are reversed.
+        Time complexity: O(√N + k), where k = r - l.
+        """
+        assert 0 <= l <= r <= self.size
+        if r - l <= 1:
+            return
+        bl = self._cut(l)
+        br = self._cut(r)
+        self.a[bl:br] = [a[::-1] for a in reversed(self.a[bl:br])]
+        self._agg[bl:br] = [None] * (br - bl)
+        self._merge_small(br)
+        self._merge_small(bl)
+
     def __setitem__(self, i: int, x: T) -> None:
         """
         Set the value of an element by index.
         Time complexity: O(√N).
         """
         assert 0 <= i <= self.size or -self.size <= i <= -1
-        a, _, i = self._position(i)
+        a, b, i = self._position(i)
         a[i] = x
+        self._agg[b] = None
 
     def _pop(self, a: List[T], b: int, i: int) -> T:
         """
@@ -188,8 +333,10 @@ class SqrtList(Generic[T]):
         """
         ans = a.pop(i)
         self.size -= 1
+        self._agg[b] = None
         if not a:
             del self.a[b]
+            del self._agg[b]
         return ans
 
     def pop(self, i: int = -1) -> T:
@@ -211,3 +358,41 @@ class SqrtList(Generic[T]):
         assert 0 <= i < self.size or -self.size <= i <= -1
         a, b, i = self._position(i)
         return self._pop(a, b, i)
+
+    def _bucket_prod(self, b: int) -> T:
+        """
+        Return the cached product of the b-th bucket, recomputing it if needed.
+        Time complexity: O(1) if cached, O(√N) otherwise.
+        """
+        if self._agg[b] is None:
+            self._agg[b] = reduce(self._op, self.a[b], self._e)
+        return self._agg[b]
+
+    def prod(self, l: int, r: int) -> T:
+        """
+        Return op(a[l], ..., a[r - 1]), or e if l == r.
+        Whole buckets use the cached products and only the two edge buckets are scanned.
+        Time complexity: O(√N) (amortized over edits, each of which invalidates one bucket).
+        """
+        assert self._op is not None
+        assert 0 <= l <= r <= self.size
+        op = self._op
+        res = self._e
+        pos = 0
+        for b, a in enumerate(self.a):
+            if pos >= r:
+                break
+            nxt = pos + len(a)
+            if l <= pos and nxt <= r:
+                res = op(res, self._bucket_prod(b))
+            elif l < nxt:
+                res = reduce(op, a[max(l - pos, 0) : min(r, nxt) - pos], res)
+            pos = nxt
+        return res
+
+    def all_prod(self) -> T:
+        """
+        Return the product of all elements.
+        Time complexity: O(√N).
+        """
+        return self.prod(0, self.size)
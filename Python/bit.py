@@ -1,3 +1,6 @@
+from sys import byteorder
+
+
 def popcount(n: int):
     # 64bit以下の整数に対するpopcount
     # python3.10以降ならint.bit_count()でよい
@@ -73,3 +76,260 @@ class BitSet:
 
     def __len__(self) -> int:
         return self._n
+
+
+class FastSet:
+    """
+    64分木のbitを用いたset (van Emde Boas 風)
+    [0, n) の非負整数の集合を管理できる
+    挿入・削除・存在判定・x以上の最小値・x以下の最大値がO(log_64 N)
+    昇順の全列挙ができる
+    """
+
+    def __init__(self, n: int, a=()):
+        assert n >= 1
+        self._n = n
+        self._size = 0
+        self._seg = []
+        while True:
+            n = (n + 63) >> 6
+            self._seg.append([0] * n)
+            if n == 1:
+                break
+        for x in a:
+            self.add(x)
+
+    def add(self, x: int) -> bool:
+        """
+        要素を追加する
+        既にあった場合はFalse,新規で追加された場合はTrueを返す
+        """
+        assert 0 <= x < self._n
+        seg = self._seg
+        if seg[0][x >> 6] >> (x & 63) & 1:
+            return False
+        for h in seg:
+            h[x >> 6] |= 1 << (x & 63)
+            x >>= 6
+        self._size += 1
+        return True
+
+    def discard(self, x: int) -> bool:
+        """
+        要素を削除する
+        存在した場合はTrue,存在しなかった場合はFalseを返す
+        """
+        assert 0 <= x < self._n
+        seg = self._seg
+        if not seg[0][x >> 6] >> (x & 63) & 1:
+            return False
+        for h in seg:
+            h[x >> 6] &= ~(1 << (x & 63))
+            if h[x >> 6]:
+                break
+            x >>= 6
+        self._size -= 1
+        return True
+
+    def __contains__(self, x: int) -> bool:
+        """
+        存在判定
+        """
+        return 0 <= x < self._n and self._seg[0][x >> 6] >> (x & 63) & 1 == 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        """
+        昇順に列挙する
+        """
+        x = self.next(0)
+        while x is not None:
+            yield x
+            x = self.next(x + 1)
+
+    def __str__(self) -> str:
+        return "FastSet" + str(list(self))
+
+    def next(self, x: int):
+        """
+        x以上の最小の要素を返す。存在しない場合はNone
+        """
+        if x < 0:
+            x = 0
+        if x >= self._n:
+            return None
+        seg = self._seg
+        for h in range(len(seg)):
+            if (x >> 6) == len(seg[h]):
+                break
+            d = seg[h][x >> 6] >> (x & 63)
+            if d == 0:
+                x = (x >> 6) + 1
+                continue
+            x += (d & -d).bit_length() - 1
+            for g in range(h - 1, -1, -1):
+                d = seg[g][x]
+                x = x << 6 | ((d & -d).bit_length() - 1)
+            return x
+        return None
+
+    def prev(self, x: int):
+        """
+        x以下の最大の要素を返す。存在しない場合はNone
+        """
+        if x >= self._n:
+            x = self._n - 1
+        if x < 0:
+            return None
+        seg = self._seg
+        for h in range(len(seg)):
+            if x == -1:
+                break
+            d = seg[h][x >> 6] & ((2 << (x & 63)) - 1)
+            if d == 0:
+                x = (x >> 6) - 1
+                continue
+            x = (x >> 6 << 6) + d.bit_length() - 1
+            for g in range(h - 1, -1, -1):
+                x = x << 6 | (seg[g][x].bit_length() - 1)
+            return x
+        return None
+
+    def min(self):
+        """
+        最小の要素を返す。存在しない場合はNone
+        """
+        return self.next(0)
+
+    def max(self):
+        """
+        最大の要素を返す。存在しない場合はNone
+        """
+        return self.prev(self._n - 1)
+
+
+class BigBitSet:
+    """
+    多倍長整数1個で [0, n) の非負整数の集合を管理するbitset
+    和集合・積集合・対称差・差集合・シフトがO(N/64)でまとめて行える
+    bitset高速化のDP(部分和の到達可能性、推移閉包の行など)向け
+    """
+
+    def __init__(self, n: int, bits: int = 0):
+        self._n = n
+        self._mask = (1 << n) - 1
+        self.bits = bits & self._mask
+
+    @classmethod
+    def from_iterable(cls, n: int, a):
+        """
+        イテラブルからまとめて構築する
+        O(N/8 + len(a))
+        """
+        buf = bytearray((n + 7) >> 3)
+        for x in a:
+            assert 0 <= x < n
+            buf[x >> 3] |= 1 << (x & 7)
+        return cls(n, int.from_bytes(buf, "little"))
+
+    def _new(self, bits: int):
+        return BigBitSet(self._n, bits)
+
+    def add(self, x: int) -> bool:
+        """
+        要素を追加する
+        既にあった場合はFalse,新規で追加された場合はTrueを返す
+        """
+        assert 0 <= x < self._n
+        if self.bits >> x & 1:
+            return False
+        self.bits |= 1 << x
+        return True
+
+    def discard(self, x: int) -> bool:
+        """
+        要素を削除する
+        存在した場合はTrue,存在しなかった場合はFalseを返す
+        """
+        assert 0 <= x < self._n
+        if self.bits >> x & 1:
+            self.bits ^= 1 << x
+            return True
+        return False
+
+    def __contains__(self, x: int) -> bool:
+        return 0 <= x < self._n and self.bits >> x & 1 == 1
+
+    def __len__(self) -> int:
+        """
+        popcount
+        """
+        return self.bits.bit_count()
+
+    def __iter__(self):
+        """
+        一度だけバイト列に変換し、64bitワードごとに最下位bitを取り出しながら昇順に列挙する
+        O(N/64 + popcount)
+        """
+        words = memoryview(
+            self.bits.to_bytes(((self._n + 63) >> 6) << 3, byteorder)
+        ).cast("Q")
+        for i, w in enumerate(words):
+            base = i << 6
+            while w:
+                low = w & -w
+                yield base + low.bit_length() - 1
+                w ^= low
+
+    def __eq__(self, other) -> bool:
+        return self.bits == other.bits
+
+    def __str__(self) -> str:
+        return "BigBitSet" + str(list(self))
+
+    def __or__(self, other):
+        return self._new(self.bits | other.bits)
+
+    def __and__(self, other):
+        return self._new(self.bits & other.bits)
+
+    def __xor__(self, other):
+        return self._new(self.bits ^ other.bits)
+
+    def __sub__(self, other):
+        return self._new(self.bits & ~other.bits)
+
+    def __invert__(self):
+        return self._new(~self.bits)
+
+    def __lshift__(self, k: int):
+        return self._new(self.bits << k)
+
+    def __rshift__(self, k: int):
+        return self._new(self.bits >> k)
+
+    def __ior__(self, other):
+        self.bits |= other.bits
+        return self
+
+    def __iand__(self, other):
+        self.bits &= other.bits
+        return self
+
+    def __ixor__(self, other):
+        self.bits ^= other.bits
+        return self
+
+    def __isub__(self, other):
+        self.bits &= ~other.bits
+        return self
+
+    def __ilshift__(self, k: int):
+        self.bits = (self.bits << k) & self._mask
+        return self
+
+    def __irshift__(self, k: int):
+        self.bits >>= k
+        return self
@@ -27,6 +27,410 @@ def dijkstra(ed, s):
     return dis
 
 
+def csr(g: list[list]) -> tuple[list[int], list[int], list[int]]:
+    """
+    隣接リストをCSR形式に変換する
+    O(N+M)
+    g: 隣接リスト[(次の頂点, 重み)] (辺はタプルでもリストでもよい) または 重みなしの隣接リスト[次の頂点]
+    returns:
+        start: 頂点vから出る辺は to[start[v]:start[v+1]]
+        to: 辺の行き先
+        cost: 辺の重み (重みなしの場合は空のリスト)
+    """
+    n = len(g)
+    start = [0] * (n + 1)
+    for v in range(n):
+        start[v + 1] = start[v] + len(g[v])
+    if start[n] and isinstance(next(e for e in g if e)[0], (tuple, list)):
+        to = [u for e in g for u, _ in e]
+        cost = [w for e in g for _, w in e]
+    else:
+        to = [u for e in g for u in e]
+        cost = []
+    return start, to, cost
+
+
+def edge_csr(
+    n: int, edge: list[tuple[int, int, int]]
+) -> tuple[list[int], list[int], list[int]]:
+    """
+    辺のリストをCSR形式に変換する (返り値は csr と同じ)
+    O(N+M)
+    n: 頂点数
+    edge: (i, j, k) i -> j の辺の長さがk
+    """
+    start = [0] * (n + 1)
+    for x, _, _ in edge:
+        start[x + 1] += 1
+    for v in range(n):
+        start[v + 1] += start[v]
+    pos = start[:n]
+    to = [0] * len(edge)
+    cost = [0] * len(edge)
+    for x, y, z in edge:
+        to[pos[x]] = y
+        cost[pos[x]] = z
+        pos[x] += 1
+    return start, to, cost
+
+
+def dijkstra_csr(
+    start: list[int],
+    to: list[int],
+    cost: list[int],
+    s,
+    targets=(),
+    restore: bool = False,
+    engine: str = "heap",
+):
+    """
+    CSR形式のグラフ上のダイクストラ O((N+M) log N)
+    heapには (距離, 頂点) のタプルではなく 距離 * N + 頂点 の整数1個を積む
+    重みは非負整数のみ (最初に1回だけチェックする)
+    cost が空 (重みなしのCSR) なら全ての辺の重みを1とする
+    engine: 優先度付きキューの種類
+        "heap": 二分ヒープ (heapq) O((N+M) log N)
+        "dial": 最大の重みをCとしてC+1個のバケットを循環させる (Dial法) O(N+M+C*N)
+            重みが小さい整数のとき向け。bfs_01 の一般化 (k-BFS)
+        "radix": radix heap O(M + N log(C*N))
+            重みが大きくても整数ならよい
+    s: 始点 (リストなら全て距離0の多始点)
+    targets: 空でなければ、その頂点が全て確定した時点で打ち切る
+        (打ち切った場合、未確定の頂点の距離は正しいとは限らない)
+    restore: Trueなら直前の頂点の配列を作る
+    returns:
+        dis: 距離 (到達不能ならinf)
+        prev: 最短路における直前の頂点 (始点・到達不能なら-1, restore=Falseなら None)
+    """
+    from heapq import heapify, heappop, heappush
+
+    if not cost:
+        cost = [1] * len(to)
+    assert min(cost, default=0) >= 0  # 負の辺はダメ
+    assert engine in ("heap", "dial", "radix")
+    inf = float("inf")
+    n = len(start) - 1
+    dis = [inf] * n
+    prev = [-1] * n if restore else None
+    sources = [s] if isinstance(s, int) else s
+    for v in sources:
+        dis[v] = 0
+    rest = set(targets)
+    if engine == "dial":
+        _dijkstra_dial(start, to, cost, sources, rest, dis, prev)
+        return dis, prev
+    if engine == "radix":
+        _dijkstra_radix(start, to, cost, sources, rest, dis, prev)
+        return dis, prev
+    heap = list(sources)
+    heapify(heap)
+    while heap:
+        d, v = divmod(heappop(heap), n)
+        if d > dis[v]:
+            continue
+        if rest:
+            rest.discard(v)
+            if not rest:
+                break
+        for i in range(start[v], start[v + 1]):
+            u = to[i]
+            nd = d + cost[i]
+            if nd < dis[u]:
+                dis[u] = nd
+                if restore:
+                    prev[u] = v
+                heappush(heap, nd * n + u)
+    return dis, prev
+
+
+def _dijkstra_dial(start, to, cost, sources, rest, dis, prev) -> None:
+    """
+    dijkstra_csr の Dial法 (バケットキュー) による本体
+    距離 d のバケットは buckets[d % (C + 1)]
+    """
+    m = max(cost, default=0) + 1
+    buckets = [[] for _ in range(m)]
+    buckets[0].extend(sources)
+    pending = len(sources)
+    d = 0
+    while pending:
+        bucket = buckets[d % m]
+        while bucket:
+            v = bucket.pop()
+            pending -= 1
+            if dis[v] != d:
+                continue
+            if rest:
+                rest.discard(v)
+                if not rest:
+                    return
+            for i in range(start[v], start[v + 1]):
+                u = to[i]
+                nd = d + cost[i]
+                if nd < dis[u]:
+                    dis[u] = nd
+                    if prev is not None:
+                        prev[u] = v
+                    buckets[nd % m].append(u)
+                    pending += 1
+        d += 1
+
+
+def _dijkstra_radix(start, to, cost, sources, rest, dis, prev) -> None:
+    """
+    dijkstra_csr の radix heap による本体
+    キーは 距離 * N + 頂点 で、距離 d は buckets[(d ^ last).bit_length()] に入る
+    """
+    n = len(start) - 1
+    buckets = [[] for _ in range((max(cost, default=0) * n).bit_length() + 2)]
+    b0 = buckets[0]
+    b0.extend(sources)
+    pending = len(sources)
+    last = 0
+    while pending:
+        if not b0:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bi = buckets[i]
+            last = min(bi) // n
+            for x in bi:
+                buckets[(x // n ^ last).bit_length()].append(x)
+            bi.clear()
+        v = b0.pop() % n
+        pending -= 1
+        d = last
+        if d > dis[v]:
+            continue
+        if rest:
+            rest.discard(v)
+            if not rest:
+                return
+        for i in range(start[v], start[v + 1]):
+            u = to[i]
+            nd = d + cost[i]
+            if nd < dis[u]:
+                dis[u] = nd
+                if prev is not None:
+                    prev[u] = v
+                buckets[(nd ^ last).bit_length()].append(nd * n + u)
+                pending += 1
+
+
+def restore_path(prev: list[int], t: int) -> list[int]:
+    """
+    直前の頂点の配列から、始点から t までのパスを復元する
+    O(パスの長さ)
+    """
+    path = [t]
+    while prev[path[-1]] != -1:
+        path.append(prev[path[-1]])
+    return path[::-1]
+
+
+def reverse_csr(
+    start: list[int], to: list[int], cost: list[int]
+) -> tuple[list[int], list[int], list[int]]:
+    """
+    CSR形式のグラフの全ての辺を逆向きにしたグラフをCSR形式で返す
+    O(N+M)
+    """
+    n = len(start) - 1
+    rstart = [0] * (n + 1)
+    for u in to:
+        rstart[u + 1] += 1
+    for v in range(n):
+        rstart[v + 1] += rstart[v]
+    pos = rstart[:n]
+    rto = [0] * len(to)
+    rcost = [0] * len(cost)
+    for v in range(n):
+        for i in range(start[v], start[v + 1]):
+            u = to[i]
+            rto[pos[u]] = v
+            if cost:
+                rcost[pos[u]] = cost[i]
+            pos[u] += 1
+    return rstart, rto, rcost
+
+
+def bidirectional_dijkstra(
+    start: list[int],
+    to: list[int],
+    cost: list[int],
+    rstart: list[int],
+    rto: list[int],
+    rcost: list[int],
+    s: int,
+    t: int,
+    restore: bool = False,
+):
+    """
+    両方向ダイクストラで s から t への最短距離を求める
+    s から順向きのグラフ、t から逆向きのグラフ (reverse_csr) を交互に探索し、
+    2つのheapの先頭の和が暫定の答え以上になったら打ち切るので、触る頂点が少ない
+    重みは非負整数のみ。cost, rcost が空 (重みなしのCSR) なら全ての辺の重みを1とする
+    returns:
+        dis: s から t への最短距離 (到達不能ならinf)
+        path: 最短路の頂点列 (restore=False もしくは到達不能なら None)
+    """
+    from heapq import heappop, heappush
+
+    if not cost:
+        cost = [1] * len(to)
+    if not rcost:
+        rcost = [1] * len(rto)
+    inf = float("inf")
+    n = len(start) - 1
+    df = [inf] * n
+    db = [inf] * n
+    pf = [-1] * n
+    pb = [-1] * n
+    df[s] = 0
+    db[t] = 0
+    hf = [s]
+    hb = [t]
+    best = 0 if s == t else inf
+    meet = s if s == t else -1
+    while hf and hb:
+        if hf[0] // n + hb[0] // n >= best:
+            break
+        if hf[0] <= hb[0]:
+            d, v = divmod(heappop(hf), n)
+            if d > df[v]:
+                continue
+            for i in range(start[v], start[v + 1]):
+                u = to[i]
+                nd = d + cost[i]
+                if nd < df[u]:
+                    df[u] = nd
+                    pf[u] = v
+                    heappush(hf, nd * n + u)
+                    if nd + db[u] < best:
+                        best = nd + db[u]
+                        meet = u
+        else:
+            d, v = divmod(heappop(hb), n)
+            if d > db[v]:
+                continue
+            for i in range(rstart[v], rstart[v + 1]):
+                u = rto[i]
+                nd = d + rcost[i]
+                if nd < db[u]:
+                    db[u] = nd
+                    pb[u] = v
+                    heappush(hb, nd * n + u)
+                    if nd + df[u] < best:
+                        best = nd + df[u]
+                        meet = u
+    if not restore or best == inf:
+        return best, None
+    path = restore_path(pf, meet)
+    while pb[path[-1]] != -1:
+        path.append(pb[path[-1]])
+    return best, path
+
+
+def astar(
+    start: list[int],
+    to: list[int],
+    cost: list[int],
+    s: int,
+    t: int,
+    h,
+    restore: bool = False,
+):
+    """
+    A* で s から t への最短距離を求める
+    h(v): v から t への距離の下界 (admissible かつ consistent であること)
+        grid_csr で作ったグリッドなら manhattan_heuristic / euclidean_heuristic が使える
+    h が 0 のときはダイクストラと同じ
+    cost が空 (重みなしのCSR) なら全ての辺の重みを1とする
+    returns:
+        dis: s から t への最短距離 (到達不能ならinf)
+        path: 最短路の頂点列 (restore=False もしくは到達不能なら None)
+    """
+    from heapq import heappop, heappush
+
+    if not cost:
+        cost = [1] * len(to)
+    inf = float("inf")
+    n = len(start) - 1
+    dis = [inf] * n
+    prev = [-1] * n
+    dis[s] = 0
+    heap = [(h(s), 0, s)]
+    while heap:
+        _, d, v = heappop(heap)
+        if d > dis[v]:
+            continue
+        if v == t:
+            break
+        for i in range(start[v], start[v + 1]):
+            u = to[i]
+            nd = d + cost[i]
+            if nd < dis[u]:
+                dis[u] = nd
+                prev[u] = v
+                heappush(heap, (nd + h(u), nd, u))
+    if not restore or dis[t] == inf:
+        return dis[t], None
+    return dis[t], restore_path(prev, t)
+
+
+def grid_csr(
+    g: list[list[str]],
+    block: list[str],
+    dxy=((-1, 0), (1, 0), (0, -1), (0, 1)),
+) -> tuple[list[int], list[int], list[int]]:
+    """
+    bfs_grid と同じ形式のグリッドを、重み1のCSR形式のグラフに変換する
+    マス (x, y) は頂点 x * W + y
+    block: 侵入できないマスの文字
+    """
+    h = len(g)
+    w = len(g[0])
+    block = set(block)
+    start = [0] * (h * w + 1)
+    to = []
+    for x in range(h):
+        for y in range(w):
+            if g[x][y] not in block:
+                for dx, dy in dxy:
+                    nx = x + dx
+                    ny = y + dy
+                    if 0 <= nx < h and 0 <= ny < w and g[nx][ny] not in block:
+                        to.append(nx * w + ny)
+            start[x * w + y + 1] = len(to)
+    return start, to, [1] * len(to)
+
+
+def manhattan_heuristic(w: int, tx: int, ty: int):
+    """
+    grid_csr のグリッドで、ゴール (tx, ty) へのマンハッタン距離を返す関数を作る
+    上下左右の移動のときに admissible
+    """
+
+    def h(v: int) -> int:
+        x, y = divmod(v, w)
+        return abs(x - tx) + abs(y - ty)
+
+    return h
+
+
+def euclidean_heuristic(w: int, tx: int, ty: int):
+    """
+    grid_csr のグリッドで、ゴール (tx, ty) へのユークリッド距離を返す関数を作る
+    """
+    from math import hypot
+
+    def h(v: int) -> float:
+        x, y = divmod(v, w)
+        return hypot(x - tx, y - ty)
+
+    return h
+
+
 def bellman_ford(
     n: int, edge: list[tuple[int, int, int]], s: int
 ) -> tuple[bool, list[int]]:
@@ -86,6 +490,143 @@ def bellman_ford(
     return False, d
 
 
+def spfa(n: int, edge: list[tuple[int, int, int]], s: int) -> tuple[bool, list[int]]:
+    """
+    キューを使ったベルマンフォード (SPFA)
+    更新された頂点だけを見直すので、多くの場合 bellman_ford より速い (最悪 O(NM))
+    各頂点の最短路の辺数を数え、N本以上になった時点で負の閉路を検出し、その頂点からは更新しない
+    引数と返り値は bellman_ford と同じ
+    Return
+        bool: 負の閉路が無い: True, 負の閉路がある: False
+        list[int]: s->iへの距離の最短の長さ。負の閉路およびそこから延びる頂点は-inf
+    """
+    from collections import deque
+    from sys import stderr
+
+    inf = float("inf")
+    start, to, cost = edge_csr(n, edge)
+
+    d = [inf] * n
+    d[s] = 0
+    cnt = [0] * n  # 最短路の辺の本数
+    in_queue = bytearray(n)
+    bad = bytearray(n)  # 負の閉路から延びる頂点
+    neg_cycle_nodes = []
+    deq = deque([s])
+    in_queue[s] = 1
+    while deq:
+        v = deq.popleft()
+        in_queue[v] = 0
+        if bad[v]:
+            continue
+        dv = d[v]
+        for i in range(start[v], start[v + 1]):
+            y = to[i]
+            if d[y] > dv + cost[i] and not bad[y]:
+                d[y] = dv + cost[i]
+                cnt[y] = cnt[v] + 1
+                if cnt[y] >= n:
+                    bad[y] = 1
+                    neg_cycle_nodes.append(y)
+                elif not in_queue[y]:
+                    in_queue[y] = 1
+                    deq.append(y)
+    if not neg_cycle_nodes:
+        return True, d
+    print("負の閉路あり", file=stderr)
+    deq = deque(neg_cycle_nodes)
+    for v in neg_cycle_nodes:
+        d[v] = -inf
+    while deq:
+        v = deq.popleft()
+        for i in range(start[v], start[v + 1]):
+            if d[to[i]] != -inf:
+                d[to[i]] = -inf
+                deq.append(to[i])
+    return False, d
+
+
+def bellman_ford_np(
+    n: int, edge: list[tuple[int, int, int]], s: int
+) -> tuple[bool, list[int]]:
+    """
+    NumPy版のベルマンフォード O(NM) だが1ラウンドの緩和を np.minimum.at で一括で行う
+    引数と返り値は bellman_ford と同じ
+    Return
+        bool: 負の閉路が無い: True, 負の閉路がある: False
+        list[int]: s->iへの距離の最短の長さ。負の閉路およびそこから延びる頂点は-inf
+    """
+    import numpy as np
+    from sys import stderr
+
+    inf = float("inf")
+    e = np.array(edge, dtype=np.int64).reshape(-1, 3)
+    src, dst = e[:, 0], e[:, 1]
+    w = e[:, 2].astype(np.float64)
+    d = np.full(n, inf)
+    d[s] = 0
+    for _ in range(n - 1):
+        nd = d.copy()
+        np.minimum.at(nd, dst, d[src] + w)
+        if not (nd < d).any():
+            break
+        d = nd
+
+    nd = d.copy()
+    np.minimum.at(nd, dst, d[src] + w)
+    bad = nd < d
+    if bad.any():
+        print("負の閉路あり", file=stderr)
+        while True:
+            nbad = bad.copy()
+            nbad[dst[bad[src]]] = True
+            if (nbad == bad).all():
+                break
+            bad = nbad
+        d[bad] = -inf
+    res = [x if x == inf or x == -inf else int(x) for x in d.tolist()]
+    return not bad.any(), res
+
+
+def johnson(n: int, edge: list[tuple[int, int, int]], workers: int = None):
+    """
+    Johnson法で全頂点対の最短距離を計算する O(NM log N)
+    疎なグラフなら warshall_floyd より速く、負の辺があってもよい
+    1. 仮想の始点から SPFA でポテンシャル h を求める
+    2. 辺 (x, y, z) の重みを z + h[x] - h[y] (>= 0) に変える
+    3. 全頂点からダイクストラを行う。ShortestPathEngine.many_sources を使うので、
+       workers > 1 ならCSRの配列を共有メモリに置いてプロセスプールで分担する
+    Args
+        n: 頂点数
+        edge: (i, j, k) i -> j の辺の長さがk (整数)
+        workers: プロセス数 (None なら CPU の数, 1 ならプールを使わない)
+    Return
+        bool: 負の閉路が無い: True, 負の閉路がある: False
+        list[array]: dis[i][j] が i -> j の最短距離 (到達不能ならinf) の array("d") のリスト
+            負の閉路がある場合は空のリスト
+    """
+    from array import array
+
+    ok, h = spfa(n + 1, list(edge) + [(n, v, 0) for v in range(n)], n)
+    if not ok:
+        return False, []
+    h.pop()
+    start, to, cost = edge_csr(n, edge)
+    for x in range(n):
+        hx = h[x]
+        for i in range(start[x], start[x + 1]):
+            cost[i] += hx - h[to[i]]
+    engine = ShortestPathEngine.from_csr(start, to, cost, True)
+    dis = engine.many_sources(list(range(n)), workers)
+    inf = float("inf")
+    for s in range(n):
+        hs = h[s]
+        dis[s] = array(
+            "d", [d - hs + ht if d != inf else inf for d, ht in zip(dis[s], h)]
+        )
+    return True, dis
+
+
 def bfs(g: list[list[int]], s: int) -> list[int]:
     """
     普通のBFS
@@ -175,6 +716,200 @@ def bfs_grid(
     return dis
 
 
+def bfs_grid_flat(
+    g: list[list[str]],
+    sources: list[tuple[int, int]],
+    block: list[str],
+    dxy=((-1, 0), (1, 0), (0, -1), (0, 1)),
+) -> list[int]:
+    """
+    グリッド上の多始点BFS (1次元化版)
+    O(HW)
+    g: グリッド (各マスは1文字)
+    sources: 始点 (x, y) のリスト。全て距離0から始める
+    block: 侵入できない座標
+    グリッドを壁で囲ってから1次元の bytearray に潰し、
+    移動を添字の差分で表すので、範囲外判定もタプルの生成もしない
+    returns:
+        マス (x, y) の距離が [x * W + y] に入った長さ HW のリスト (到達不能なら-1)
+    """
+    h = len(g)
+    w = len(g[0])
+    p = max(max(abs(dx), abs(dy)) for dx, dy in dxy)
+    W = w + 2 * p
+    table = bytearray([1]) * 256
+    for c in block:
+        table[ord(c)] = 0
+    ok = bytearray(W * p + p)
+    for row in g:
+        ok += bytearray("".join(row), "ascii").translate(table)
+        ok += bytearray(2 * p)
+    ok += bytearray(W * p - p)
+    deltas = [dx * W + dy for dx, dy in dxy]
+    dis = [-1] * len(ok)
+    cur = []
+    for x, y in sources:
+        v = (x + p) * W + y + p
+        if dis[v] == -1:
+            dis[v] = 0
+            ok[v] = 0
+            cur.append(v)
+    # 距離ごとにまとめて広げる
+    nd = 0
+    while cur:
+        nd += 1
+        nxt = []
+        for d in deltas:
+            for v in cur:
+                u = v + d
+                if ok[u]:
+                    ok[u] = 0
+                    nxt.append(u)
+        for u in nxt:
+            dis[u] = nd
+        cur = nxt
+    res = []
+    for x in range(p, h + p):
+        res += dis[x * W + p : x * W + p + w]
+    return res
+
+
+def low_link(g: list[list[int]]):
+    """
+    無向グラフの lowlink を再帰なしで求める
+    O(N+M)
+    g: 無向グラフの隣接リスト (各辺は両方の頂点のリストに入れる。多重辺・非連結でもよい)
+    returns:
+        bridges: 橋 (親, 子) のリスト
+        articulation: 関節点のリスト
+        two_edge: 各頂点の二重辺連結成分の番号
+        bcc: 二重頂点連結成分ごとの頂点のリスト (関節点は複数の成分に入る。孤立点・自己ループのみの頂点は1頂点の成分)
+    """
+    n = len(g)
+    ord_ = [-1] * n
+    low = [0] * n
+    parent = [-1] * n
+    it = [0] * n
+    skipped = bytearray(n)  # 親への辺を1本読み飛ばしたか (多重辺対策)
+    is_art = bytearray(n)
+    bridges = []
+    two_edge = [-1] * n
+    bcc = []
+    t = 0
+    k = 0
+    for r in range(n):
+        if ord_[r] != -1:
+            continue
+        ord_[r] = low[r] = t
+        t += 1
+        if all(u == r for u in g[r]):
+            # 自己ループしかない頂点も孤立点と同じく1頂点の成分
+            bcc.append([r])
+        st = [r]
+        vst = [r]  # 二重頂点連結成分用
+        est = [r]  # 二重辺連結成分用
+        root_children = 0
+        while st:
+            v = st[-1]
+            if it[v] < len(g[v]):
+                u = g[v][it[v]]
+                it[v] += 1
+                if u == parent[v] and not skipped[v]:
+                    skipped[v] = 1
+                    continue
+                if ord_[u] == -1:
+                    parent[u] = v
+                    ord_[u] = low[u] = t
+                    t += 1
+                    st.append(u)
+                    vst.append(u)
+                    est.append(u)
+                elif ord_[u] < low[v]:
+                    low[v] = ord_[u]
+                continue
+            st.pop()
+            p = parent[v]
+            if p == -1:
+                while est:
+                    two_edge[est.pop()] = k
+                k += 1
+                continue
+            if low[v] < low[p]:
+                low[p] = low[v]
+            if low[v] >= ord_[p]:
+                if p == r:
+                    root_children += 1
+                else:
+                    is_art[p] = 1
+                comp = [p]
+                while True:
+                    x = vst.pop()
+                    comp.append(x)
+                    if x == v:
+                        break
+                bcc.append(comp)
+            if low[v] > ord_[p]:
+                bridges.append((p, v))
+                while True:
+                    x = est.pop()
+                    two_edge[x] = k
+                    if x == v:
+                        break
+                k += 1
+        if root_children >= 2:
+            is_art[r] = 1
+    articulation = [v for v in range(n) if is_art[v]]
+    return bridges, articulation, two_edge, bcc
+
+
+def kruskal(n: int, us: list[int], vs: list[int], ws: list[int]):
+    """
+    クラスカル法で最小全域森を求める
+    O(M log M)
+    辺 i は us[i] - vs[i] を重み ws[i] で結ぶ
+    辺のタプルをソートせず、重みの配列を argsort する (NumPy があれば np.argsort)
+    Union-Find (union by size + path halving) はループ内に展開してあり、
+    N-1 本採用した時点で打ち切る
+    returns:
+        total: 採用した辺の重みの和
+        used: 採用した辺の番号のリスト (重みの昇順)
+    """
+    m = len(ws)
+    try:
+        import numpy as np
+
+        order = np.argsort(np.asarray(ws), kind="stable").tolist()
+    except ImportError:
+        order = sorted(range(m), key=ws.__getitem__)
+    par = [-1] * n
+    total = 0
+    used = []
+    rest = n - 1
+    for i in order:
+        if rest == 0:
+            break
+        x = us[i]
+        while par[x] >= 0:
+            if par[par[x]] >= 0:
+                par[x] = par[par[x]]
+            x = par[x]
+        y = vs[i]
+        while par[y] >= 0:
+            if par[par[y]] >= 0:
+                par[y] = par[par[y]]
+            y = par[y]
+        if x == y:
+            continue
+        if par[x] > par[y]:
+            x, y = y, x
+        par[x] += par[y]
+        par[y] = x
+        total += ws[i]
+        used.append(i)
+        rest -= 1
+    return total, used
+
+
 def warshall_floyd(g: list[list[tuple[int, int]]]) -> tuple[bool, list[list[int]]]:
     """
     全頂点対の最短距離を計算する
@@ -211,3 +946,227 @@ def warshall_floyd(g: list[list[tuple[int, int]]]) -> tuple[bool, list[list[int]
                         dis[i][j] = -inf
     print("負の閉路あり", file=stderr)
     return not neg_cycle_exist, dis
+
+
+def warshall_floyd_np(
+    g: list[list[tuple[int, int]]],
+) -> tuple[bool, list[list[int]]]:
+    """
+    全頂点対の最短距離を計算する (NumPy版)
+    O(N^3) だが k ごとの更新を np.fmin で一括で行うので N=1000 程度まで可能
+    距離は float64 で持つので、絶対値が 2^53 を超える距離は誤差が出る
+    負の辺があってもよい
+    returns:
+        bool: 負の閉路がないならTrue
+        list[list[int]]: 頂点対の最短距離 (負の閉路を経由できる頂点対は-inf)
+    """
+    import numpy as np
+    from sys import stderr
+
+    n = len(g)
+    inf = float("inf")
+    dis = np.full((n, n), inf)
+    for i in range(n):
+        for j, w in g[i]:
+            if w < dis[i, j]:
+                dis[i, j] = w
+    diag = np.arange(n)
+    dis[diag, diag] = np.minimum(dis[diag, diag], 0)
+
+    # 負の閉路があると距離が -inf まで発散し、-inf + inf = nan になるので、
+    # nan の候補を無視する np.fmin を使う (Python の min と同じ結果になる)
+    for k in range(n):
+        np.fmin(dis, dis[:, k, None] + dis[None, k, :], out=dis)
+
+    neg = dis[diag, diag] < 0
+    ok = not neg.any()
+    if not ok:
+        print("負の閉路あり", file=stderr)
+        reach_to = (dis[:, neg] != inf).astype(np.int64)
+        reach_from = (dis[neg, :] != inf).astype(np.int64)
+        dis[(reach_to @ reach_from) > 0] = -inf
+    res = [
+        [x if x == inf or x == -inf else int(x) for x in row] for row in dis.tolist()
+    ]
+    return ok, res
+
+
+_engine = None
+
+
+def _engine_init(names: list[str], n: int, weighted: bool) -> None:
+    from multiprocessing import shared_memory
+
+    global _engine
+    shms = [shared_memory.SharedMemory(name=name) for name in names]
+    arrays = [shm.buf.cast("q") for shm in shms]
+    _engine = object.__new__(ShortestPathEngine)
+    _engine._shms = shms
+    _engine._set_graph(n, arrays[0], arrays[1], arrays[2] if weighted else [], weighted)
+
+
+def _engine_rows(sources: list[int]) -> list[bytes]:
+    from array import array
+
+    code = "d" if _engine.weighted else "q"
+    return [array(code, _engine.run(s)).tobytes() for s in sources]
+
+
+class ShortestPathEngine:
+    """
+    同じグラフに対して何度も最短距離を求めるためのクラス
+    CSRへの変換は最初の1回だけで、距離の配列は毎回使い回す
+    重み付きならダイクストラ (到達不能はinf)、重みなしならBFS (到達不能は-1)
+    g: 隣接リスト[(次の頂点, 重み)] または 重みなしの隣接リスト[次の頂点]
+    weighted: 重み付きとして扱うか。None なら辺の形から判定する
+        (辺が1本もないグラフは判定できないので指定すること)
+        重みなしの隣接リストで True にすると全ての辺の重みを1とする
+    """
+
+    def __init__(self, g: list[list], weighted: bool = None) -> None:
+        start, to, cost = csr(g)
+        if weighted is None:
+            assert to, "辺がないグラフでは weighted を指定すること"
+            weighted = len(cost) > 0
+        if not weighted:
+            cost = []
+        elif not cost:
+            cost = [1] * len(to)
+        assert min(cost, default=0) >= 0  # 負の辺はダメ
+        self._set_graph(len(g), start, to, cost, weighted)
+
+    @classmethod
+    def from_csr(
+        cls, start: list[int], to: list[int], cost: list[int], weighted: bool
+    ) -> "ShortestPathEngine":
+        """
+        CSR形式のグラフ (csr, edge_csr の返り値) から作る
+        weighted なら cost は非負整数であること
+        """
+        assert not weighted or min(cost, default=0) >= 0  # 負の辺はダメ
+        engine = object.__new__(cls)
+        engine._set_graph(len(start) - 1, start, to, cost if weighted else [], weighted)
+        return engine
+
+    def _set_graph(self, n: int, start, to, cost, weighted: bool) -> None:
+        self.n = n
+        self.start = start
+        self.to = to
+        self.cost = cost
+        self.weighted = weighted
+        self._unreached = float("inf") if self.weighted else -1
+        self._dis = [self._unreached] * n
+        # 前回の探索で値を書き込んだ頂点。次の探索の前にここだけ戻す
+        self._touched = []
+
+    def run(self, s: int) -> list[int]:
+        """
+        s からの最短距離
+        返り値のリストは次の呼び出しで上書きされるので、残す場合はコピーすること
+        """
+        return self.multi_source([s])
+
+    def multi_source(self, sources: list[int]) -> list[int]:
+        """
+        sources の全ての頂点を距離0としたときの最短距離 (1回の探索で求める)
+        返り値のリストは次の呼び出しで上書きされるので、残す場合はコピーすること
+        """
+        dis = self._dis
+        unreached = self._unreached
+        for v in self._touched:
+            dis[v] = unreached
+        if self.weighted:
+            self._touched = self._dijkstra(dis, sources)
+        else:
+            self._touched = self._bfs(dis, sources)
+        return dis
+
+    def _dijkstra(self, dis: list[int], sources: list[int]) -> list[int]:
+        from heapq import heapify, heappop, heappush
+
+        start, to, cost, n = self.start, self.to, self.cost, self.n
+        inf = self._unreached
+        touched = []
+        heap = []
+        for v in sources:
+            if dis[v] == inf:
+                touched.append(v)
+            dis[v] = 0
+            heap.append(v)
+        heapify(heap)
+        while heap:
+            d, v = divmod(heappop(heap), n)
+            if d > dis[v]:
+                continue
+            for i in range(start[v], start[v + 1]):
+                u = to[i]
+                nd = d + cost[i]
+                if nd < dis[u]:
+                    if dis[u] == inf:
+                        touched.append(u)
+                    dis[u] = nd
+                    heappush(heap, nd * n + u)
+        return touched
+
+    def _bfs(self, dis: list[int], sources: list[int]) -> list[int]:
+        start, to = self.start, self.to
+        q = []
+        for v in sources:
+            if dis[v] == -1:
+                dis[v] = 0
+                q.append(v)
+        for v in q:
+            nd = dis[v] + 1
+            for i in range(start[v], start[v + 1]):
+                u = to[i]
+                if dis[u] == -1:
+                    dis[u] = nd
+                    q.append(u)
+        return q
+
+    def many_sources(self, sources: list[int], workers: int = None) -> list:
+        """
+        sources の各頂点からの最短距離をそれぞれ求める
+        workers > 1 ならプロセスプールで分担する。グラフの配列は共有メモリに置くので、
+        各プロセスにグラフをpickleして送らない (重みは整数のみ)
+        returns:
+            res[i] が sources[i] からの距離の array ("d": 重み付き, "q": 重みなし)
+        """
+        from array import array
+        from os import cpu_count
+
+        code = "d" if self.weighted else "q"
+        if workers is None:
+            workers = cpu_count() or 1
+        if workers <= 1:
+            return [array(code, self.run(s)) for s in sources]
+
+        from multiprocessing import Pool, shared_memory
+
+        arrays = [self.start, self.to] + ([self.cost] if self.weighted else [])
+        shms = []
+        try:
+            for a in arrays:
+                b = array("q", a).tobytes()
+                shm = shared_memory.SharedMemory(create=True, size=max(len(b), 8))
+                shm.buf[: len(b)] = b
+                shms.append(shm)
+            chunk = max(1, len(sources) // (workers * 4))
+            tasks = [sources[i : i + chunk] for i in range(0, len(sources), chunk)]
+            with Pool(
+                workers,
+                initializer=_engine_init,
+                initargs=([shm.name for shm in shms], self.n, self.weighted),
+            ) as pool:
+                results = pool.map(_engine_rows, tasks)
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+        res = []
+        for rows in results:
+            for b in rows:
+                row = array(code)
+                row.frombytes(b)
+                res.append(row)
+        return res
@@ -26,3 +26,112 @@ def swag(l, k, mode="min"):
             if i >= k - 1:
                 result.append(l[deq[0]])
     return result
+
+
+class SlidingWindowAggregation:
+    """
+    2本のスタックによるSWAG
+    結合則を満たす任意の演算 op (単位元 e) について、
+    末尾への追加・先頭の削除・全体の集約が償却O(1)
+    (和 mod p, gcd, 行列積, 一次関数の合成など。可換でなくてもよい)
+    """
+
+    def __init__(self, op, e):
+        self._op = op
+        self._e = e
+        # 前側のスタック。_front_agg[i] は _front[i], ..., _front[0] の集約値
+        self._front = []
+        self._front_agg = []
+        # 後ろ側のスタック。_back_agg は _back 全体の集約値
+        self._back = []
+        self._back_agg = e
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._back)
+
+    def push(self, x) -> None:
+        """
+        末尾に x を追加する
+        """
+        self._back.append(x)
+        self._back_agg = self._op(self._back_agg, x)
+
+    def pop(self):
+        """
+        先頭の要素を削除して返す
+        """
+        assert len(self) > 0
+        if not self._front:
+            op = self._op
+            agg = self._e
+            for x in reversed(self._back):
+                agg = op(x, agg)
+                self._front.append(x)
+                self._front_agg.append(agg)
+            self._back.clear()
+            self._back_agg = self._e
+        self._front_agg.pop()
+        return self._front.pop()
+
+    def fold(self):
+        """
+        先頭から末尾までの集約値を返す。空なら e
+        """
+        if self._front_agg:
+            return self._op(self._front_agg[-1], self._back_agg)
+        return self._back_agg
+
+
+def swag_fold(it, k: int, op, e):
+    """
+    イテレータ it から連続してk個選ぶ時の op による集約値を順に yield する。
+    入力全体をメモリに持たない。n - k + 1 個の値を生成する。償却O(1)/要素
+    """
+    assert k >= 1
+    sw = SlidingWindowAggregation(op, e)
+    for x in it:
+        sw.push(x)
+        if len(sw) > k:
+            sw.pop()
+        if len(sw) == k:
+            yield sw.fold()
+
+
+def swag_np(a, k: int, mode="min"):
+    """
+    a の中から連続してk個選ぶ時、左端が 0 ~ n-k の時それぞれの最小値、最大値、総和を取得。
+    NumPy があれば ndarray (n - k + 1 個) を返す。O(N) で Python のループを回さない。
+    min/max: van Herk/Gil-Werman法 (長さkのブロックごとの累積min/maxを前後から取る)
+    sum: 累積和の差分 (int64 のオーバーフローに注意)
+    NumPy が無い環境では swag と同じ処理にフォールバックし、list を返す。
+    """
+    assert mode in ("min", "max", "sum")
+    try:
+        import numpy as np
+    except ImportError:
+        if mode == "sum":
+            from itertools import accumulate
+
+            c = [0] + list(accumulate(a))
+            return [c[i + k] - c[i] for i in range(len(c) - k)]
+        return swag(list(a), k, mode)
+
+    a = np.asarray(a)
+    n = a.shape[0]
+    assert 1 <= k <= n
+    if mode == "sum":
+        # uint64 と int64 の result_type は float64 になり精度が落ちるので、uint64 はそのまま
+        if a.dtype == np.uint64:
+            dtype = a.dtype
+        else:
+            dtype = np.result_type(a.dtype, np.int64)
+        c = np.zeros(n + 1, dtype=dtype)
+        np.cumsum(a, out=c[1:])
+        return c[k:] - c[:-k]
+    f = np.minimum if mode == "min" else np.maximum
+    m = (n + k - 1) // k
+    # 末尾のブロックの埋め草は答えに使われないので、最後の値で埋めておく
+    b = np.concatenate((a, np.full(m * k - n, a[-1], dtype=a.dtype))).reshape(m, k)
+    prefix = f.accumulate(b, axis=1).ravel()
+    suffix = f.accumulate(b[:, ::-1], axis=1)[:, ::-1].ravel()
+    return f(suffix[: n - k + 1], prefix[k - 1 : n])
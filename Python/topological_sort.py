@@ -1,4 +1,5 @@
 from collections import deque, defaultdict
+from heapq import heappop, heappush
 
 
 def topological_sort(n: int, output_edge, input_edge_num):
@@ -17,3 +18,121 @@ def topological_sort(n: int, output_edge, input_edge_num):
     if len(ans) == n:
         return ans
     return False
+
+
+def _find_cycle(g: list[list[int]], indeg: list[int]) -> list[int]:
+    """
+    トポロジカルソートで残った頂点 (入次数が0にならなかった頂点) から閉路を1つ探す
+    残った頂点は全て、残った頂点からの入辺を持つので、入辺を逆にたどれば閉路に入る
+    """
+    n = len(g)
+    pred = [-1] * n
+    for v in range(n):
+        if indeg[v]:
+            for next in g[v]:
+                if indeg[next]:
+                    pred[next] = v
+    v = indeg.index(max(indeg))
+    seen = [False] * n
+    while not seen[v]:
+        seen[v] = True
+        v = pred[v]
+    cycle = [v]
+    u = pred[v]
+    while u != v:
+        cycle.append(u)
+        u = pred[u]
+    return cycle[::-1]
+
+
+def topological_sort_nd(g: list[list[int]], smallest: bool = False):
+    """
+    入次数を g から自分で数えるトポロジカルソート (引数を書き換えない)
+    O(N+M) (smallest=True のときは O(N log N + M))
+    g: 隣接リスト
+    smallest: Trueなら辞書順最小のトポロジカル順序を返す (heapを使う)
+    returns:
+        bool: DAGならTrue
+        list[int]: DAGならトポロジカル順序、閉路があればその閉路の頂点列
+    """
+    n = len(g)
+    indeg = [0] * n
+    for v in range(n):
+        for next in g[v]:
+            indeg[next] += 1
+    order = [v for v in range(n) if indeg[v] == 0]
+    if smallest:
+        heap = order
+        order = []
+        while heap:
+            v = heappop(heap)
+            order.append(v)
+            for next in g[v]:
+                indeg[next] -= 1
+                if indeg[next] == 0:
+                    heappush(heap, next)
+    else:
+        for v in order:
+            for next in g[v]:
+                indeg[next] -= 1
+                if indeg[next] == 0:
+                    order.append(next)
+    if len(order) == n:
+        return True, order
+    return False, _find_cycle(g, indeg)
+
+
+def dag_path_dp(g: list[list], sources=None, mode: str = "longest", mod: int = None):
+    """
+    トポロジカルソートと同時に、DAG上の最長路/最短路と、その長さを達成するパスの数を求める
+    O(N+M)
+    g: 隣接リスト[(次の頂点, 重み)] または 重みなしの隣接リスト[次の頂点] (重み1)
+    sources: 始点のリスト (Noneなら入次数0の頂点全て)
+    mode: "longest" または "shortest"
+    mod: Noneでなければパスの数を mod で割った余りにする
+    returns:
+        bool: DAGならTrue
+        list[int]: DAGならトポロジカル順序、閉路があればその閉路の頂点列
+        dist: 始点からの最長/最短の長さ (到達不能なら longest: -inf, shortest: inf)
+        cnt: その長さを達成するパスの数 (到達不能なら0)
+    """
+    assert mode in ("longest", "shortest")
+    n = len(g)
+    weighted = any(isinstance(e[0], (tuple, list)) for e in g if e)
+    indeg = [0] * n
+    for v in range(n):
+        for e in g[v]:
+            indeg[e[0] if weighted else e] += 1
+    inf = float("inf")
+    longest = mode == "longest"
+    dist = [-inf if longest else inf] * n
+    cnt = [0] * n
+    order = [v for v in range(n) if indeg[v] == 0]
+    for v in order if sources is None else sources:
+        dist[v] = 0
+        cnt[v] = 1
+    for v in order:
+        dv = dist[v]
+        cv = cnt[v]
+        for e in g[v]:
+            if weighted:
+                next, w = e
+            else:
+                next, w = e, 1
+            if cv:
+                nd = dv + w
+                if nd == dist[next]:
+                    cnt[next] += cv
+                    if mod is not None:
+                        cnt[next] %= mod
+                elif (nd > dist[next]) if longest else (nd < dist[next]):
+                    dist[next] = nd
+                    cnt[next] = cv
+            indeg[next] -= 1
+            if indeg[next] == 0:
+                order.append(next)
+    if len(order) == n:
+        return True, order, dist, cnt
+    if weighted:
+        g = [[e[0] for e in es] for es in g]
+    return False, _find_cycle(g, indeg), dist, cnt
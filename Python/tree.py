@@ -94,3 +94,393 @@ def tree_dp_pretreatment(g: list[list[int]], s: int = 0):
                 to_pearent[next].append(v)
     order = order[::-1]
     return order, to_child, to_pearent
+
+
+class LCA:
+    """
+    sを根とした木の最小共通祖先 (LCA)
+    euler_tour の行きがけ順の上で、区間内の「親の行きがけ順の番号」の最小値を
+    Sparse Table で求めるので、前計算 O(N log N)、クエリ O(1)
+    k個上の祖先はダブリング (1次元の配列) で O(log N)
+    """
+
+    def __init__(self, g: list[list[int]], s: int = 0):
+        n = self.n = len(g)
+        l, r, order = euler_tour(g, s)
+        self.l = l
+        self.r = r
+        self.order = order
+        parent = self.parent = [-1] * n
+        depth = self.depth = [0] * n
+        for v in order:
+            for next in g[v]:
+                if next != parent[v]:
+                    parent[next] = v
+                    depth[next] = depth[v] + 1
+        # table[j][i]: order[i], ..., order[i + 2^j - 1] の親の行きがけ順の番号の最小値
+        row = [-1] + [l[parent[v]] for v in order[1:]]
+        table = self._table = [row]
+        j = 1
+        while (1 << j) <= n:
+            prev = table[-1]
+            h = 1 << (j - 1)
+            table.append([min(prev[i], prev[i + h]) for i in range(n - (1 << j) + 1)])
+            j += 1
+        # up[k * n + v]: v の 2^k 個上の祖先 (存在しなければ-1)
+        self._log = max(1, (n - 1).bit_length())
+        up = self._up = parent + [-1] * (n * (self._log - 1))
+        for k in range(1, self._log):
+            base = (k - 1) * n
+            for v in range(n):
+                p = up[base + v]
+                up[k * n + v] = -1 if p == -1 else up[base + p]
+
+    def lca(self, u: int, v: int) -> int:
+        """
+        u と v の最小共通祖先 O(1)
+        """
+        if u == v:
+            return u
+        a = self.l[u]
+        b = self.l[v]
+        if a > b:
+            a, b = b, a
+        a += 1
+        b += 1
+        j = (b - a).bit_length() - 1
+        t = self._table[j]
+        return self.order[min(t[a], t[b - (1 << j)])]
+
+    def dist(self, u: int, v: int) -> int:
+        """
+        u と v の距離 O(1)
+        """
+        d = self.depth
+        return d[u] + d[v] - 2 * d[self.lca(u, v)]
+
+    def dist_many(self, us: list[int], vs: list[int]) -> list[int]:
+        """
+        dist(us[i], vs[i]) のリスト
+        """
+        l, order, depth, table = self.l, self.order, self.depth, self._table
+        res = []
+        for u, v in zip(us, vs):
+            a = l[u]
+            b = l[v]
+            if a == b:
+                res.append(0)
+                continue
+            if a > b:
+                a, b = b, a
+            a += 1
+            b += 1
+            j = (b - a).bit_length() - 1
+            t = table[j]
+            w = order[min(t[a], t[b - (1 << j)])]
+            res.append(depth[u] + depth[v] - 2 * depth[w])
+        return res
+
+    def kth_ancestor(self, v: int, k: int) -> int:
+        """
+        v の k 個上の祖先。存在しなければ-1
+        O(log N)
+        """
+        if k > self.depth[v]:
+            return -1
+        n, up = self.n, self._up
+        i = 0
+        while k:
+            if k & 1:
+                v = up[i * n + v]
+            k >>= 1
+            i += 1
+        return v
+
+    def jump(self, u: int, v: int, k: int) -> int:
+        """
+        u から v へのパス上で、u から k 番目の頂点。パスの長さが k 未満なら-1
+        O(log N)
+        """
+        w = self.lca(u, v)
+        du = self.depth[u] - self.depth[w]
+        dv = self.depth[v] - self.depth[w]
+        if k <= du:
+            return self.kth_ancestor(u, k)
+        if k <= du + dv:
+            return self.kth_ancestor(v, du + dv - k)
+        return -1
+
+
+class Rerooting:
+    """
+    全方位木DP
+    O(N) (merge, add_root の呼び出しが O(N) 回)
+    tree_dp_pretreatment と同じBFS順を使い、親と隣接リスト上の位置だけを1次元の配列で持つ
+    (頂点ごとの子のリストは作らない)。再帰なし。
+    g: 木の隣接リスト
+    merge(a, b): 子の部分木の値をまとめる演算 (結合的で、e が単位元)
+    add_root(x, v): 子の値をまとめた x に頂点 v を根として加えた、v の部分木の値
+    dp[v]: v を根としたときの木全体の値
+    """
+
+    def __init__(self, g: list[list[int]], merge, e, add_root, s: int = 0):
+        from collections import deque
+
+        n = len(g)
+        parent = [-1] * n
+        # idx[v]: v の隣接リストの中での親の位置 (根は-1)
+        idx = [-1] * n
+        order = []
+        deq = deque([s])
+        visited = [False] * n
+        visited[s] = True
+        while deq:
+            v = deq.popleft()
+            order.append(v)
+            for i, next in enumerate(g[v]):
+                if visited[next] == False:
+                    visited[next] = True
+                    parent[next] = v
+                    deq.append(next)
+                else:
+                    idx[v] = i
+
+        # 下から: sub[v] は v を根とする部分木の値
+        acc = [e] * n
+        sub = [e] * n
+        for v in reversed(order):
+            sub[v] = add_root(acc[v], v)
+            p = parent[v]
+            if p != -1:
+                acc[p] = merge(acc[p], sub[v])
+
+        # 上から: up[v] は v の親側の部分木の値 (根は v の親)
+        up = [e] * n
+        dp = [e] * n
+        for v in order:
+            nv = g[v]
+            d = len(nv)
+            pi = idx[v]
+            vals = [sub[u] for u in nv]
+            if pi != -1:
+                vals[pi] = up[v]
+            # suf[i] = merge(vals[i], ..., vals[d - 1])
+            suf = [e] * (d + 1)
+            for i in range(d - 1, -1, -1):
+                suf[i] = merge(vals[i], suf[i + 1])
+            dp[v] = add_root(suf[0], v)
+            pre = e
+            for i in range(d):
+                if i != pi:
+                    up[nv[i]] = add_root(merge(pre, suf[i + 1]), v)
+                pre = merge(pre, vals[i])
+        self.order = order
+        self.parent = parent
+        self.idx = idx
+        self.sub = sub
+        self.up = up
+        self.dp = dp
+
+    def __getitem__(self, v: int):
+        return self.dp[v]
+
+
+class HLD:
+    """
+    重軽分解 (Heavy-Light Decomposition)
+    sを根とした木のパスを O(log N) 個の区間に分け、セグ木 (acl/SegTree.py, acl/LazeSegTree.py) で
+    パス上の集約・更新を O(log^2 N) で行う。前計算は O(N) で再帰なし。
+    頂点 v の値はセグ木の pos[v] 番目に置く (初期値は [a[v] for v in hld.order] で作る)
+    v の部分木は区間 [pos[v], pos[v] + size[v])
+    """
+
+    def __init__(self, g: list[list[int]], s: int = 0):
+        from collections import deque
+
+        n = self.n = len(g)
+        parent = self.parent = [-1] * n
+        depth = self.depth = [0] * n
+        order = []
+        deq = deque([s])
+        visited = [False] * n
+        visited[s] = True
+        while deq:
+            v = deq.popleft()
+            order.append(v)
+            for next in g[v]:
+                if visited[next] == False:
+                    visited[next] = True
+                    parent[next] = v
+                    depth[next] = depth[v] + 1
+                    deq.append(next)
+        size = self.size = [1] * n
+        heavy = self.heavy = [-1] * n
+        for v in reversed(order):
+            p = parent[v]
+            if p != -1:
+                size[p] += size[v]
+                if heavy[p] == -1 or size[v] > size[heavy[p]]:
+                    heavy[p] = v
+        # 重い子を最後に積むことで、重いパスが連続した区間になる
+        head = self.head = [s] * n
+        pos = self.pos = [-1] * n
+        self.order = [-1] * n
+        st = [s]
+        t = 0
+        while st:
+            v = st.pop()
+            pos[v] = t
+            self.order[t] = v
+            t += 1
+            for next in g[v]:
+                if next != parent[v] and next != heavy[v]:
+                    head[next] = next
+                    st.append(next)
+            if heavy[v] != -1:
+                head[heavy[v]] = head[v]
+                st.append(heavy[v])
+
+    def lca(self, u: int, v: int) -> int:
+        """
+        u と v の最小共通祖先 O(log N)
+        """
+        head, parent, depth = self.head, self.parent, self.depth
+        while head[u] != head[v]:
+            if depth[head[u]] > depth[head[v]]:
+                u = parent[head[u]]
+            else:
+                v = parent[head[v]]
+        return u if depth[u] < depth[v] else v
+
+    def path_segments(self, u: int, v: int, edge: bool = False):
+        """
+        u から v へのパスを、セグ木上の区間 [l, r) のリストに分ける O(log N)
+        u から順に並べ、(l, r, up) の up が True の区間は u 側から見て pos の降順にたどる
+        edge: Trueなら辺に値を持つ場合 (辺の値は子の頂点に置く) として、LCAを含めない
+        """
+        head, parent, depth, pos = self.head, self.parent, self.depth, self.pos
+        up_segs = []
+        down_segs = []
+        while head[u] != head[v]:
+            if depth[head[u]] >= depth[head[v]]:
+                up_segs.append((pos[head[u]], pos[u] + 1, True))
+                u = parent[head[u]]
+            else:
+                down_segs.append((pos[head[v]], pos[v] + 1, False))
+                v = parent[head[v]]
+        if depth[u] >= depth[v]:
+            up_segs.append((pos[v] + edge, pos[u] + 1, True))
+        else:
+            down_segs.append((pos[u] + edge, pos[v] + 1, False))
+        return [x for x in up_segs + down_segs[::-1] if x[0] < x[1]]
+
+    def path_prod(self, seg, u: int, v: int, op, e, edge: bool = False):
+        """
+        u - v パス上の値の集約 O(log^2 N)
+        seg: SegTree または LazySegTree (op, e はそのセグ木と同じもの。op は可換であること)
+        """
+        res = e
+        for l, r, _ in self.path_segments(u, v, edge):
+            res = op(res, seg.prod(l, r))
+        return res
+
+    def path_apply(self, seg, u: int, v: int, f, edge: bool = False) -> None:
+        """
+        u - v パス上の値に f を作用させる O(log^2 N)
+        seg: LazySegTree
+        """
+        for l, r, _ in self.path_segments(u, v, edge):
+            seg.apply(l, r, f)
+
+    def subtree(self, v: int) -> tuple[int, int]:
+        """
+        v の部分木に対応するセグ木上の区間 [l, r)
+        """
+        return self.pos[v], self.pos[v] + self.size[v]
+
+
+def _centroid_walk(g: list[list[int]], with_dists: bool):
+    """
+    重心分解の本体 (再帰なし)
+    重心 c を決めるたびに (c, 重心木での親, 深さ, 部分木ごとの (頂点, 距離) or None) を yield する
+    """
+    n = len(g)
+    removed = bytearray(n)
+    par = [-1] * n
+    sz = [1] * n
+    st = [(r, -1, 0) for r in range(n - 1, -1, -1)] if n else []
+    while st:
+        r, p, lv = st.pop()
+        if removed[r]:
+            continue
+        # r を含む連結成分をBFSで列挙し、部分木のサイズを求める
+        par[r] = -1
+        comp = [r]
+        for v in comp:
+            sz[v] = 1
+            for next in g[v]:
+                if next != par[v] and not removed[next]:
+                    par[next] = v
+                    comp.append(next)
+        for v in reversed(comp[1:]):
+            sz[par[v]] += sz[v]
+        total = len(comp)
+        c = r
+        while True:
+            for next in g[c]:
+                if next != par[c] and not removed[next] and sz[next] * 2 > total:
+                    c = next
+                    break
+            else:
+                break
+        removed[c] = 1
+        groups = None
+        if with_dists:
+            groups = []
+            for s in g[c]:
+                if removed[s]:
+                    continue
+                par[s] = c
+                vs = [s]
+                ds = [1]
+                for i, v in enumerate(vs):
+                    for next in g[v]:
+                        if next != par[v] and not removed[next]:
+                            par[next] = v
+                            vs.append(next)
+                            ds.append(ds[i] + 1)
+                groups.append((vs, ds))
+        yield c, p, lv, groups
+        for next in g[c]:
+            if not removed[next]:
+                st.append((next, c, lv + 1))
+
+
+def centroid_decomposition(g: list[list[int]]):
+    """
+    重心分解 O(N log N) (再帰なし)
+    g: 木 (森でもよい) の隣接リスト
+    returns:
+        cpar: 重心木での親 (重心木の根は-1)
+        level: 重心木での深さ (その頂点が重心として選ばれた段階)
+    """
+    n = len(g)
+    cpar = [-1] * n
+    level = [0] * n
+    for c, p, lv, _ in _centroid_walk(g, False):
+        cpar[c] = p
+        level[c] = lv
+    return cpar, level
+
+
+def centroid_subtree_dists(g: list[list[int]]):
+    """
+    重心分解をしながら、重心ごとにその成分内の距離を yield するジェネレータ
+    全体で O(N log N) (再帰なし)
+    パスの長さ・重みについての数え上げを、重心を通るパスごとに行うのに使う
+    yield:
+        c: 重心
+        groups: c を取り除いた後の部分木ごとの (頂点のリスト, c からの距離のリスト)
+    """
+    for c, _, _, groups in _centroid_walk(g, True):
+        yield c, groups